@@ -3,17 +3,205 @@ terminals to a designated logging directory """
 
 import os
 import re
+import functools
 import threading
 import queue
+import select
 import tempfile
 import subprocess
-from datetime import datetime
+import time
+from collections import OrderedDict, deque
 from gi.repository import Gtk, Vte, GLib
 import terminatorlib.plugin as plugin
 from terminatorlib.terminator import Terminator
 
 AVAILABLE = ['AutoLogger']
 
+# Resolve ptsname() once per process: os.ptsname on Python 3.13+, else libc via ctypes
+if hasattr(os, 'ptsname'):
+    def _ptsname(fd):
+        try:
+            return os.ptsname(fd)
+        except OSError:
+            return None
+else:
+    try:
+        import ctypes
+        import ctypes.util
+        
+        _libc = ctypes.CDLL(ctypes.util.find_library('c'))
+        _libc.ptsname.restype = ctypes.c_char_p
+        _libc.ptsname.argtypes = [ctypes.c_int]
+        
+        def _ptsname(fd):
+            name = _libc.ptsname(fd)
+            return name.decode('utf-8') if name else None
+    except Exception:
+        _ptsname = None
+
+# Presidio sanitizer, run as a long-lived worker fed over stdin
+_SANITIZER_PYTHON = '/opt/presidio-secrets-sanitizer/venv/bin/python3'
+_SANITIZER_SCRIPT = '/opt/presidio-secrets-sanitizer/sanitizer.py'
+_SANITIZER_TIMEOUT = 30  # seconds allowed per sanitizer request
+
+# Prompt tokens and the trailing error-code pattern (e.g. "2 ⨯", "130 ✗")
+_PROMPT_HEAD = '└─#'
+_PROMPT_END = ('$ ', '# ')
+_BOX_HEAD = '┌──'
+_SKULL = '💀'
+_ERROR_RE = re.compile(r'^\s*\d+\s*[⨯✗×✘❌]\s*$')
+
+# Line kinds produced by _classify for the log filter
+_KIND_EMPTY = 0
+_KIND_BANNER = 1
+_KIND_PROMPT_EMPTY = 2
+_KIND_PROMPT_CONTEXT = 3
+_KIND_PROMPT = 4
+_KIND_PARTIAL = 5
+_KIND_NORMAL = 6
+
+
+@functools.lru_cache(maxsize=256)
+def _classify(stripped):
+    """ Classify one stripped terminal line into a _KIND_* value in a single pass """
+    if not stripped:
+        return _KIND_EMPTY
+    
+    is_prompt_head = stripped.startswith(_PROMPT_HEAD)
+    is_prompt = (is_prompt_head or
+                 stripped.endswith(_PROMPT_END) or
+                 stripped.startswith(_BOX_HEAD) or
+                 (_BOX_HEAD in stripped and _SKULL in stripped))
+    
+    # Commands starting with "context", either after a prompt or bare
+    if is_prompt:
+        if _PROMPT_HEAD in stripped:
+            cmd_part = stripped.split(_PROMPT_HEAD, 1)[-1].strip()
+        elif stripped.endswith(_PROMPT_END):
+            cmd_part = stripped[:-2].strip()
+        else:
+            cmd_part = ""
+    else:
+        cmd_part = stripped
+    if cmd_part.startswith('context'):
+        return _KIND_PROMPT_CONTEXT
+    
+    # Session markers written by this plugin
+    if stripped.startswith('==='):
+        return _KIND_BANNER
+    
+    # Prompt with no command, or only an error code such as "2 ⨯" after it
+    is_empty_prompt = False
+    if is_prompt_head:
+        after_prompt = stripped[len(_PROMPT_HEAD):].strip()
+        is_empty_prompt = not after_prompt or _ERROR_RE.match(after_prompt) is not None
+    if not is_empty_prompt:
+        for prompt_suffix in _PROMPT_END:
+            if prompt_suffix in stripped:
+                after_prompt = stripped.rsplit(prompt_suffix, 1)[1].strip()
+                if not after_prompt or _ERROR_RE.match(after_prompt):
+                    is_empty_prompt = True
+                    break
+    
+    if is_prompt:
+        return _KIND_PROMPT_EMPTY if is_empty_prompt else _KIND_PROMPT
+    
+    # Very short input or a trailing cursor/partial input indicator
+    if (is_empty_prompt or
+            (len(stripped) <= 2 and not stripped.isdigit()) or
+            stripped.endswith(('_', '|'))):
+        return _KIND_PARTIAL
+    
+    return _KIND_NORMAL
+
+
+# Fallback poll interval when Terminator's terminal registry can't be hooked
+_POLL_INTERVAL_MS = 5000
+
+# Repeated contents-changed signals at an unchanged cursor within this window are ignored
+_SIGNAL_DEBOUNCE_US = 30000
+
+# Most scrollback rows captured above the cursor when a log file is started
+_SNAPSHOT_MAX_ROWS = 200
+
+# Upper bounds for coalescing queued items into one write / sanitizer request
+_BATCH_MAX_ITEMS = 64
+_BATCH_MAX_BYTES = 256 * 1024
+
+# Writer file handle cache: LRU cap and idle timeout
+_MAX_OPEN_FILES = 64
+_FILE_IDLE_TIMEOUT_NS = 60 * 1000000000
+
+# Longest the writer keeps data buffered while output keeps arriving, in seconds
+_FLUSH_INTERVAL = 0.2
+
+# Log files are appended through raw fds with a per-file buffer of this size
+_LOG_OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_CLOEXEC', 0)
+_WRITE_BUFFER_SIZE = 65536
+
+
+class FastQueue:
+    """ Bounded FIFO with one consumer thread. Producers may also pop the oldest item
+    through _put_drop_oldest when full; deque append/popleft are atomic under the GIL,
+    so no lock is taken and an Event only wakes the idle consumer. The size bound is
+    checked without a lock and may be overshot by a racing put """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = deque()
+        self._not_empty = threading.Event()
+
+    def put(self, item):
+        """ Enqueue item, raising queue.Full instead of blocking when at capacity """
+        if len(self._items) >= self.maxsize:
+            raise queue.Full
+        self._items.append(item)
+        self._not_empty.set()
+
+    def get_nowait(self):
+        """ Dequeue an item, raising queue.Empty if there is none """
+        try:
+            return self._items.popleft()
+        except IndexError:
+            raise queue.Empty
+
+    def get(self, timeout=None):
+        """ Dequeue an item, waiting up to timeout seconds for one to arrive """
+        try:
+            return self._items.popleft()
+        except IndexError:
+            pass
+        
+        # Re-check after clearing so a put() racing with clear() is not missed
+        self._not_empty.clear()
+        try:
+            return self._items.popleft()
+        except IndexError:
+            pass
+        
+        self._not_empty.wait(timeout)
+        return self.get_nowait()
+
+    def empty(self):
+        """ Return True if no items are queued """
+        return not self._items
+
+
+def _put_drop_oldest(work_queue, item):
+    """ Enqueue item; when the queue is full, discard the oldest entry so the newest output wins """
+    try:
+        work_queue.put(item)
+    except queue.Full:
+        try:
+            work_queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            work_queue.put(item)
+        except queue.Full:
+            pass
+
+
 class AutoLogger(plugin.Plugin):
     """ Automatically log terminal content with async I/O and unique terminal IDs """
     capabilities = ['terminal_menu']
@@ -22,17 +210,42 @@ class AutoLogger(plugin.Plugin):
     _global_pty_to_terminal_id = {}
     _global_session_timestamp = None
     _global_active_terminals = set()  # Track active terminals for cleanup
+    _seeded_files = set()  # Log paths already checked for / given a session header
+    _seed_lock = threading.Lock()
+    _terminal_listeners = []  # Instances notified when Terminator (de)registers a terminal
+    _terminator_hooked = False
+    
+    # Worker threads, their queues and the sanitizer process are shared by all instances.
+    # Raw blocks are filtered off the GTK thread, then written and sanitized.
+    _init_lock = threading.Lock()
+    _instance_count = 0
+    _filter_queue = None
+    _write_queue = None
+    _sanitize_queue = None
+    _filter_thread = None
+    _writer_thread = None
+    _sanitizer_thread = None
+    _shutdown_event = None
+    _sanitizer_lock = threading.Lock()
+    _sanitizer_proc = None
+    _sanitizer_acked = False
+    _sanitizer_daemon_supported = True
+    
+    # Log paths interned to small ints so queue items carry (file id, bytes)
+    _filepath_ids = {}
+    _filepath_table = []
     
     def __init__(self):
         plugin.Plugin.__init__(self)
         self.loggers = {}
         self.terminal_ids = {}
+        self._last_written_hash = {}  # filepath -> hash of the last text queued by _write_to_log
         self.terminal_counter = 0
         self.vte_version = Vte.get_minor_version()
         
         # Initialize global session timestamp if not set
         if AutoLogger._global_session_timestamp is None:
-            AutoLogger._global_session_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            AutoLogger._global_session_timestamp = time.strftime('%Y%m%d_%H%M%S')
         
         
         # Auto-logging configuration
@@ -42,134 +255,496 @@ class AutoLogger(plugin.Plugin):
         if not os.path.exists(self.log_directory):
             os.makedirs(self.log_directory, exist_ok=True)
         
-        # Async logging setup
-        self.write_queue = queue.Queue(maxsize=1000)
-        self.sanitize_queue = queue.Queue(maxsize=1000)
-        self._shutdown_writer = False
-        self.writer_thread = threading.Thread(target=self._async_writer, daemon=True)
-        self.sanitizer_thread = threading.Thread(target=self._async_sanitizer, daemon=True)
-        self.writer_thread.start()
-        self.sanitizer_thread.start()
+        # Async logging setup, shared by every plugin instance
+        AutoLogger._start_workers()
+        self.filter_queue = AutoLogger._filter_queue
+        self.write_queue = AutoLogger._write_queue
+        self.sanitize_queue = AutoLogger._sanitize_queue
+        self._unloaded = False
         
-        # Start monitoring for new terminals
-        GLib.timeout_add(500, self._check_for_new_terminals)
+        # Follow terminal creation/destruction through Terminator's registry
+        if AutoLogger._hook_terminator():
+            AutoLogger._terminal_listeners.append(self)
+            GLib.idle_add(self._attach_existing_terminals)
+        else:
+            # No registration hooks available, fall back to a slow poll
+            GLib.timeout_add(_POLL_INTERVAL_MS, self._check_for_new_terminals)
 
-    def _async_writer(self):
-        """ Background thread for async file writing """
-        open_files = {}
-        file_last_used = {}
-        cleanup_counter = 0
+    @classmethod
+    def _filepath_id(cls, filepath):
+        """ Return the interned id for filepath, assigning the next one on first use """
+        file_id = cls._filepath_ids.get(filepath)
+        if file_id is None:
+            file_id = len(cls._filepath_table)
+            # Publish the table entry before the id can reach a worker
+            cls._filepath_table.append(filepath)
+            cls._filepath_ids[filepath] = file_id
+        return file_id
+
+    @classmethod
+    def _start_workers(cls):
+        """ Create the shared queues and start the worker threads on first instantiation """
+        with cls._init_lock:
+            cls._instance_count += 1
+            if cls._writer_thread is not None:
+                return
+            
+            cls._filter_queue = FastQueue(maxsize=1000)
+            cls._write_queue = FastQueue(maxsize=1000)
+            cls._sanitize_queue = FastQueue(maxsize=1000)
+            cls._shutdown_event = threading.Event()
+            
+            # Persistent sanitizer worker, only talked to from the sanitizer thread
+            with cls._sanitizer_lock:
+                cls._sanitizer_acked = False
+                cls._sanitizer_daemon_supported = True
+                cls._sanitizer_proc = cls._launch_sanitizer()
+            
+            # Threads get their queues explicitly so a straggler from a previous
+            # generation can never consume from the current one
+            cls._filter_thread = threading.Thread(
+                target=cls._async_filter, daemon=True,
+                args=(cls._filter_queue, cls._write_queue, cls._sanitize_queue, cls._shutdown_event))
+            cls._writer_thread = threading.Thread(
+                target=cls._async_writer, daemon=True,
+                args=(cls._write_queue, cls._shutdown_event))
+            cls._sanitizer_thread = threading.Thread(
+                target=cls._async_sanitizer, daemon=True,
+                args=(cls._sanitize_queue, cls._shutdown_event))
+            cls._filter_thread.start()
+            cls._writer_thread.start()
+            cls._sanitizer_thread.start()
+
+    @classmethod
+    def _stop_workers(cls):
+        """ Drop one instance reference; the last one shuts the shared workers down """
+        with cls._init_lock:
+            cls._instance_count = max(0, cls._instance_count - 1)
+            if cls._instance_count > 0 or cls._writer_thread is None:
+                return
+            
+            # Stop the filter thread first so blocks it already took still reach the writers
+            try:
+                cls._filter_queue.put(None)
+            except:
+                pass
+            try:
+                cls._filter_thread.join(timeout=2.0)
+            except:
+                pass
+            
+            # Shutdown background threads
+            cls._shutdown_event.set()
+            
+            # Signal threads to stop
+            try:
+                cls._write_queue.put(None)
+            except:
+                pass
+            try:
+                cls._sanitize_queue.put(None)
+            except:
+                pass
+            
+            # Wait for threads to finish
+            try:
+                cls._writer_thread.join(timeout=2.0)
+                cls._sanitizer_thread.join(timeout=2.0)
+            except:
+                pass
+            
+            # Stop the sanitizer worker under its lock so a straggling sanitizer thread can't
+            # race us on _sanitizer_proc. A thread still waiting for an ack holds the lock;
+            # killing its worker unblocks it, and with shutdown set it won't relaunch one
+            locked = cls._sanitizer_lock.acquire(timeout=0.1)
+            if not locked:
+                proc = cls._sanitizer_proc
+                if proc is not None:
+                    try:
+                        proc.kill()
+                    except:
+                        pass
+                locked = cls._sanitizer_lock.acquire(timeout=2.0)
+            try:
+                cls._stop_sanitizer()
+            finally:
+                if locked:
+                    cls._sanitizer_lock.release()
+            
+            # Clear queues
+            for work_queue in (cls._filter_queue, cls._write_queue, cls._sanitize_queue):
+                try:
+                    while not work_queue.empty():
+                        work_queue.get_nowait()
+                except:
+                    pass
+            
+            cls._filter_queue = cls._write_queue = cls._sanitize_queue = None
+            cls._filter_thread = cls._writer_thread = cls._sanitizer_thread = None
+            cls._shutdown_event = None
+
+    @classmethod
+    def _hook_terminator(cls):
+        """ Wrap Terminator.register_terminal/deregister_terminal to notify listeners.
+        Returns False if this Terminator version lacks them """
+        if cls._terminator_hooked:
+            return True
+        
+        register = getattr(Terminator, 'register_terminal', None)
+        deregister = getattr(Terminator, 'deregister_terminal', None)
+        if not callable(register) or not callable(deregister):
+            return False
+        
+        @functools.wraps(register)
+        def register_terminal(terminator, terminal, *args, **kwargs):
+            result = register(terminator, terminal, *args, **kwargs)
+            # The terminal is still being constructed, attach once it has a VTE and PTY
+            for listener in list(cls._terminal_listeners):
+                GLib.idle_add(listener._on_terminal_registered, terminal)
+            return result
+        
+        @functools.wraps(deregister)
+        def deregister_terminal(terminator, terminal, *args, **kwargs):
+            for listener in list(cls._terminal_listeners):
+                listener._on_terminal_deregistered(terminal)
+            return deregister(terminator, terminal, *args, **kwargs)
+        
+        Terminator.register_terminal = register_terminal
+        Terminator.deregister_terminal = deregister_terminal
+        cls._terminator_hooked = True
+        return True
+
+    @staticmethod
+    def _drain_batch(work_queue, first):
+        """ Collect (file id, bytes) item first plus any items already queued behind it, up to the batch limits.
+        Returns the batch and whether the shutdown sentinel was seen """
+        batch = [first]
+        batch_bytes = len(first[1])
         
-        while not self._shutdown_writer:
+        while len(batch) < _BATCH_MAX_ITEMS and batch_bytes < _BATCH_MAX_BYTES:
             try:
-                item = self.write_queue.get(timeout=1.0)
-                if item is None:
-                    break
-                
-                if len(item) != 2:
-                    self.write_queue.task_done()
-                    continue
-                
-                filepath, content = item
+                item = work_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+            batch_bytes += len(item[1])
+        
+        return batch, False
+
+    @staticmethod
+    def _flush_entry(entry):
+        """ Write out a cached file's pending buffer with os.write """
+        fd, buf = entry[0], entry[1]
+        while buf:
+            written = os.write(fd, buf)
+            del buf[:written]
+
+    @classmethod
+    def _close_file(cls, open_files, filepath):
+        """ Drop filepath from the handle cache, flushing and closing its fd """
+        entry = open_files.pop(filepath, None)
+        if entry is not None:
+            try:
+                cls._flush_entry(entry)
+            except:
+                pass
+            try:
+                os.close(entry[0])
+            except:
+                pass
+
+    @classmethod
+    def _write_file(cls, open_files, filepath, content):
+        """ Append encoded content to filepath's buffer in the LRU fd cache """
+        try:
+            entry = open_files.get(filepath)
+            if entry is None:
+                try:
+                    fd = os.open(filepath, _LOG_OPEN_FLAGS, 0o644)
+                except FileNotFoundError:
+                    # Log directory is created in __init__; recreate it only if it vanished
+                    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+                    fd = os.open(filepath, _LOG_OPEN_FLAGS, 0o644)
+                    
+                    # The file starts over, so the next attach gets a session header again
+                    with cls._seed_lock:
+                        cls._seeded_files.discard(filepath)
                 
-                if not filepath or not content:
-                    self.write_queue.task_done()
-                    continue
+                entry = [fd, bytearray(), 0]
+                open_files[filepath] = entry
                 
+                # Evict least recently used handles beyond the cap
+                while len(open_files) > _MAX_OPEN_FILES:
+                    cls._close_file(open_files, next(iter(open_files)))
+            else:
+                open_files.move_to_end(filepath)
+            
+            entry[1] += content
+            entry[2] = time.monotonic_ns()
+            if len(entry[1]) >= _WRITE_BUFFER_SIZE:
+                cls._flush_entry(entry)
+            return True
+            
+        except Exception:
+            cls._close_file(open_files, filepath)
+            return False
+
+    @classmethod
+    def _write_batch(cls, open_files, dirty, batch):
+        """ Append each (file id, bytes) item of a batch to its file buffer """
+        for item in batch:
+            if len(item) != 2 or not item[1]:
+                continue
+            
+            file_id, content = item
+            filepath = cls._filepath_table[file_id]
+            if cls._write_file(open_files, filepath, content):
+                dirty.add(filepath)
+
+    @classmethod
+    def _flush_files(cls, open_files, dirty):
+        """ Flush every buffer written since the last flush """
+        for filepath in dirty:
+            entry = open_files.get(filepath)
+            if entry is not None:
                 try:
-                    if filepath not in open_files:
-                        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-                        open_files[filepath] = open(filepath, 'a', encoding='utf-8', buffering=1)
-                    
-                    fd = open_files[filepath]
-                    fd.write(content)
-                    fd.flush()
-                    file_last_used[filepath] = cleanup_counter
-                    
+                    cls._flush_entry(entry)
                 except Exception:
-                    if filepath in open_files:
-                        try:
-                            open_files[filepath].close()
-                        except:
-                            pass
-                        del open_files[filepath]
-                        if filepath in file_last_used:
-                            del file_last_used[filepath]
+                    cls._close_file(open_files, filepath)
+        dirty.clear()
+
+    @classmethod
+    def _async_writer(cls, write_queue, shutdown):
+        """ Background thread for async file writing """
+        # filepath -> [raw fd, pending bytes, last used in ns], least recently used first
+        open_files = OrderedDict()
+        dirty = set()
+        last_flush = time.monotonic()
+        
+        while not shutdown.is_set():
+            try:
+                first = write_queue.get(timeout=1.0)
+                if first is None:
+                    break
+                
+                batch, stop = cls._drain_batch(write_queue, first)
+                cls._write_batch(open_files, dirty, batch)
                 
-                self.write_queue.task_done()
+                # Flush once the queue drains, or periodically under sustained output
+                now = time.monotonic()
+                if write_queue.empty() or now - last_flush >= _FLUSH_INTERVAL:
+                    cls._flush_files(open_files, dirty)
+                    last_flush = now
+                
+                if stop:
+                    break
                 
             except queue.Empty:
-                # Periodically close unused files (every ~60 seconds of inactivity)
-                cleanup_counter += 1
-                if cleanup_counter % 60 == 0:
-                    files_to_close = []
-                    for filepath, last_used in file_last_used.items():
-                        if cleanup_counter - last_used > 60:  # 60 seconds of inactivity
-                            files_to_close.append(filepath)
-                    
-                    for filepath in files_to_close:
-                        if filepath in open_files:
-                            try:
-                                open_files[filepath].close()
-                            except:
-                                pass
-                            del open_files[filepath]
-                            del file_last_used[filepath]
+                cls._flush_files(open_files, dirty)
+                
+                # Close handles that have been idle for too long, oldest first
+                now = time.monotonic_ns()
+                while open_files:
+                    filepath, entry = next(iter(open_files.items()))
+                    if now - entry[2] < _FILE_IDLE_TIMEOUT_NS:
+                        break
+                    cls._close_file(open_files, filepath)
                 continue
             except Exception:
                 pass
         
-        for fd in open_files.values():
-            try:
-                fd.close()
-            except:
-                pass
+        # Write out whatever is still queued before closing (_close_file flushes)
+        try:
+            while True:
+                item = write_queue.get_nowait()
+                if item is not None:
+                    cls._write_batch(open_files, dirty, [item])
+        except queue.Empty:
+            pass
+        except Exception:
+            pass
+        
+        for filepath in list(open_files):
+            cls._close_file(open_files, filepath)
 
-    def _async_sanitizer(self):
-        """ Background thread for async sanitization using presidio """
-        while not self._shutdown_writer:
+    @classmethod
+    def _async_filter(cls, filter_queue, write_queue, sanitize_queue, shutdown):
+        """ Background thread that filters raw terminal blocks and queues them for logging """
+        while not shutdown.is_set():
             try:
-                item = self.sanitize_queue.get(timeout=1.0)
+                item = filter_queue.get(timeout=1.0)
                 if item is None:
                     break
                 
-                if len(item) != 2:
-                    self.sanitize_queue.task_done()
+                if len(item) != 3:
                     continue
                 
-                content, output_filepath = item
+                text, file_id, sanitized_file_id = item
+                filtered_lines = cls._filter_block(text)
                 
-                if not content or not output_filepath:
-                    self.sanitize_queue.task_done()
-                    continue
+                if filtered_lines:
+                    content_to_log = ('\n'.join(filtered_lines) + '\n').encode('utf-8')
+                    _put_drop_oldest(write_queue, (file_id, content_to_log))
+                    _put_drop_oldest(sanitize_queue, (sanitized_file_id, content_to_log))
                 
-                try:
-                    # Use subprocess to call presidio sanitizer
-                    process = subprocess.Popen(
-                        ['/opt/presidio-secrets-sanitizer/venv/bin/python3', 
-                         '/opt/presidio-secrets-sanitizer/sanitizer.py', 
-                         '--stdin', '-o', output_filepath],
-                        stdin=subprocess.PIPE,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True
-                    )
-                    
-                    stdout, stderr = process.communicate(input=content, timeout=30)
-                    
-                    # If sanitization fails, fail silently - no sanitized log created
-                    
-                except (subprocess.TimeoutExpired, Exception):
-                    # If sanitization fails, fail silently - no sanitized log created
-                    pass
+            except queue.Empty:
+                continue
+            except Exception:
+                pass
+
+    @classmethod
+    def _async_sanitizer(cls, sanitize_queue, shutdown):
+        """ Background thread for async sanitization using presidio """
+        while not shutdown.is_set():
+            try:
+                first = sanitize_queue.get(timeout=1.0)
+                if first is None:
+                    break
+                
+                batch, stop = cls._drain_batch(sanitize_queue, first)
+                
+                # Group by output file so each file costs one round trip to the worker
+                grouped = {}
+                for item in batch:
+                    if len(item) != 2 or not item[1]:
+                        continue
+                    file_id, content = item
+                    grouped.setdefault(file_id, []).append(content)
                 
-                self.sanitize_queue.task_done()
+                for file_id, contents in grouped.items():
+                    try:
+                        cls._sanitize(b''.join(contents), cls._filepath_table[file_id], shutdown)
+                    except Exception:
+                        # If sanitization fails, fail silently - no sanitized log created
+                        pass
+                
+                if stop:
+                    break
                 
             except queue.Empty:
                 continue
             except Exception:
                 pass
 
+    @classmethod
+    def _launch_sanitizer(cls):
+        """ Start the long-lived presidio sanitizer worker process """
+        try:
+            return subprocess.Popen(
+                [_SANITIZER_PYTHON, _SANITIZER_SCRIPT, '--daemon'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0
+            )
+        except Exception:
+            return None
+
+    @classmethod
+    def _stop_sanitizer(cls, kill=False):
+        """ Close the sanitizer worker's stdin and wait for it to exit, or kill it outright """
+        proc = cls._sanitizer_proc
+        cls._sanitizer_proc = None
+        if proc is None:
+            return
+        
+        try:
+            proc.stdin.close()
+        except:
+            pass
+        if not kill:
+            try:
+                proc.wait(timeout=2)
+                return
+            except Exception:
+                pass
+        
+        try:
+            proc.kill()
+            proc.wait(timeout=1)
+        except:
+            pass
+
+    @classmethod
+    def _sanitize_via_daemon(cls, content, output_filepath):
+        """ Send one 'LEN <n> OUT <path>' framed record of UTF-8 bytes to the worker and wait for its ack """
+        proc = cls._sanitizer_proc
+        if proc is None or proc.poll() is not None:
+            raise BrokenPipeError("sanitizer worker is not running")
+        
+        frame = memoryview(f"LEN {len(content)} OUT {output_filepath}\n".encode('utf-8') + content)
+        while frame:
+            written = proc.stdin.write(frame)
+            frame = frame[written:]
+        
+        ack = cls._read_ack(proc)
+        if ack != b'OK\n':
+            raise OSError(f"unexpected sanitizer ack {bytes(ack)!r}")
+        cls._sanitizer_acked = True
+
+    @staticmethod
+    def _read_ack(proc):
+        """ Read one ack line from the worker, giving up after _SANITIZER_TIMEOUT seconds """
+        fd = proc.stdout.fileno()
+        deadline = time.monotonic() + _SANITIZER_TIMEOUT
+        ack = bytearray()
+        
+        while not ack.endswith(b'\n'):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError("sanitizer worker did not ack in time")
+            
+            # Byte at a time so nothing past the ack line is consumed
+            chunk = os.read(fd, 1)
+            if not chunk:
+                raise EOFError("sanitizer worker closed its output")
+            ack += chunk
+        
+        return ack
+
+    @classmethod
+    def _sanitize_oneshot(cls, content, output_filepath):
+        """ Sanitize UTF-8 content by running the sanitizer once in --stdin mode """
+        process = subprocess.Popen(
+            [_SANITIZER_PYTHON, _SANITIZER_SCRIPT, '--stdin', '-o', output_filepath],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        try:
+            process.communicate(input=content, timeout=_SANITIZER_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+
+    @classmethod
+    def _sanitize(cls, content, output_filepath, shutdown):
+        """ Sanitize content into output_filepath, relaunching the worker if it died """
+        with cls._sanitizer_lock:
+            if cls._sanitizer_daemon_supported:
+                try:
+                    cls._sanitize_via_daemon(content, output_filepath)
+                    return
+                except (OSError, EOFError):
+                    cls._stop_sanitizer(kill=True)
+                
+                if cls._sanitizer_acked:
+                    # A worker that used to answer died or stalled; relaunch it unless shutting down
+                    if not shutdown.is_set():
+                        cls._sanitizer_proc = cls._launch_sanitizer()
+                        try:
+                            cls._sanitize_via_daemon(content, output_filepath)
+                        except (OSError, EOFError):
+                            cls._stop_sanitizer(kill=True)
+                    return
+                
+                # Installed sanitizer never answered in --daemon mode, fall back to one-shot runs
+                cls._sanitizer_daemon_supported = False
+            
+            cls._sanitize_oneshot(content, output_filepath)
+
     def _get_terminal_id(self, terminal):
         """ Generate or retrieve unique ID for terminal """
         vte_terminal = terminal.get_vte()
@@ -180,19 +755,12 @@ class AutoLogger(plugin.Plugin):
         
         # Get PTY information to check for duplicates
         try:
-            pty_fd = vte_terminal.get_pty().get_fd()
-            import ctypes
-            import ctypes.util
-            
-            libc = ctypes.CDLL(ctypes.util.find_library('c'))
-            ptsname = libc.ptsname
-            ptsname.restype = ctypes.c_char_p
-            ptsname.argtypes = [ctypes.c_int]
+            if _ptsname is None:
+                raise OSError("ptsname() is unavailable")
             
-            pts_name = ptsname(pty_fd)
+            pty_fd = vte_terminal.get_pty().get_fd()
+            pts_name = _ptsname(pty_fd)
             if pts_name:
-                pts_name = pts_name.decode('utf-8')
-                
                 # Check if we already have a terminal ID for this PTY path (globally)
                 if pts_name in AutoLogger._global_pty_to_terminal_id:
                     terminal_id = AutoLogger._global_pty_to_terminal_id[pts_name]
@@ -235,8 +803,41 @@ class AutoLogger(plugin.Plugin):
         except Exception:
             pass
 
+    def _attach_existing_terminals(self):
+        """ Start logging for terminals that were open before the plugin loaded """
+        try:
+            for terminal in Terminator().terminals:
+                if terminal.get_vte() not in self.loggers:
+                    self._start_logging(terminal)
+        except:
+            pass
+        return False
+
+    def _on_terminal_registered(self, terminal):
+        """ Start logging for a terminal Terminator just registered """
+        if self in AutoLogger._terminal_listeners:
+            self._cleanup_global_pty_dict()
+            self._start_logging(terminal)
+        return False
+
+    def _on_terminal_deregistered(self, terminal):
+        """ Stop logging for a terminal Terminator is removing """
+        try:
+            self._stop_logging(terminal.get_vte())
+        except:
+            pass
+
+    def _on_size_changed(self, vte_terminal, *args):
+        """ Refresh the cached column count after a resize or font change """
+        logger_info = self.loggers.get(vte_terminal)
+        if logger_info is not None:
+            logger_info["col_count"] = vte_terminal.get_column_count()
+
     def _check_for_new_terminals(self):
         """ Check for new terminals and clean up destroyed ones """
+        if self._unloaded:
+            return False
+        
         try:
             terminator = Terminator()
             current_vte_terminals = set()
@@ -259,7 +860,7 @@ class AutoLogger(plugin.Plugin):
             else:
                 self._cleanup_counter = 0
             
-            if self._cleanup_counter >= 60:  # 60 * 500ms = 30 seconds
+            if self._cleanup_counter >= 6:  # 6 * 5s = 30 seconds
                 self._cleanup_global_pty_dict()
                 self._cleanup_counter = 0
                 
@@ -294,17 +895,15 @@ class AutoLogger(plugin.Plugin):
             return ""
 
 
-    def _looks_like_prompt(self, line_content):
-        """ Simple detection of prompt lines """
-        if not line_content:
+    def _looks_like_prompt(self, stripped):
+        """ Simple detection of prompt lines, expects an already stripped line """
+        if not stripped:
             return False
         
-        line = line_content.strip()
-        return (line.startswith('└─#') or 
-                line.endswith('$ ') or 
-                line.endswith('# ') or
-                line.startswith('┌──') or
-                ('┌──' in line and '💀' in line))
+        return (stripped.startswith(_PROMPT_HEAD) or
+                stripped.endswith(_PROMPT_END) or
+                stripped.startswith(_BOX_HEAD) or
+                (_BOX_HEAD in stripped and _SKULL in stripped))
 
 
     def _write_to_log(self, vte_terminal, text):
@@ -322,10 +921,14 @@ class AutoLogger(plugin.Plugin):
             
             clean_text = text.strip()
             if clean_text:
-                try:
-                    self.write_queue.put((filepath, f"{clean_text}\n"), timeout=0.1)
-                except queue.Full:
-                    pass
+                # Drop an immediate re-queue of the same text for this file
+                text_hash = hash(clean_text)
+                if self._last_written_hash.get(filepath) == text_hash:
+                    return
+                self._last_written_hash[filepath] = text_hash
+                
+                _put_drop_oldest(self.write_queue, (AutoLogger._filepath_id(filepath),
+                                                    f"{clean_text}\n".encode('utf-8')))
         except Exception:
             pass
 
@@ -347,9 +950,19 @@ class AutoLogger(plugin.Plugin):
             if current_row <= last_row:
                 return
             
+            # Collapse repaint storms: skip if the cursor hasn't moved since a check a few ms ago
+            now = GLib.get_monotonic_time()
+            if (current_row == logger_info["last_cursor_row"] and
+                    current_col == logger_info["last_col"] and
+                    now - logger_info["last_signal_time"] < _SIGNAL_DEBOUNCE_US):
+                return
+            logger_info["last_cursor_row"] = current_row
+            logger_info["last_col"] = current_col
+            logger_info["last_signal_time"] = now
+            
             # Get current line content to check if it's a new prompt
             current_line = self._get_content(vte_terminal, current_row, 0, 
-                                           current_row, vte_terminal.get_column_count())
+                                           current_row, logger_info["col_count"])
             
             # Only log when we see a new prompt (indicating previous command completed)
             if current_line and self._looks_like_prompt(current_line.strip()):
@@ -358,44 +971,12 @@ class AutoLogger(plugin.Plugin):
                 end_row = current_row
                 
                 new_content = self._get_content(vte_terminal, start_row, 0, 
-                                              end_row, vte_terminal.get_column_count())
+                                              end_row, logger_info["col_count"])
                 
                 if new_content:
-                    lines = new_content.split('\n')
-                    filtered_lines = []
-                    skip_until_prompt = False
-                    
-                    for line in lines:
-                        stripped = line.strip()
-                        
-                        # Check if this line starts a "context" command
-                        if self._is_context_command(stripped):
-                            skip_until_prompt = True
-                            continue
-                        
-                        # If we're skipping context output, check if we hit a new prompt
-                        if skip_until_prompt:
-                            if self._looks_like_prompt(stripped):
-                                skip_until_prompt = False
-                                # Include the new prompt line
-                                if not self._is_empty_prompt(stripped):
-                                    filtered_lines.append(line.rstrip())
-                            continue
-                        
-                        # Skip empty lines, session markers, and empty prompts
-                        if stripped and not stripped.startswith('==='):
-                            if not self._is_empty_prompt(stripped):
-                                if not self._is_partial_command(stripped):
-                                    filtered_lines.append(line.rstrip())
-                    
-                    if filtered_lines:
-                        content_to_log = '\n'.join(filtered_lines) + '\n'
-                        
-                        try:
-                            self.write_queue.put((logger_info["filepath"], content_to_log), timeout=0.1)
-                            self.sanitize_queue.put((content_to_log, logger_info["sanitized_filepath"]), timeout=0.1)
-                        except queue.Full:
-                            pass
+                    # Filtering happens on the filter thread; only the VTE read must stay here
+                    _put_drop_oldest(self.filter_queue, (new_content, logger_info["file_id"],
+                                                         logger_info["sanitized_file_id"]))
                 
                 # Update last row position only after logging
                 logger_info["last_row"] = current_row
@@ -403,103 +984,39 @@ class AutoLogger(plugin.Plugin):
         except:
             pass
 
-    def _is_partial_command(self, line_content):
-        """ Check if this looks like a partial command being typed """
-        if not line_content:
-            return True
+    @classmethod
+    def _filter_block(cls, text):
+        """ Filter a block of terminal text down to the lines worth logging """
+        filtered_lines = []
+        skip_until_prompt = False
         
-        # If it's a prompt line, it's complete
-        if self._looks_like_prompt(line_content):
-            return False
-        
-        # Check for common incomplete patterns
-        stripped = line_content.strip()
-        
-        # Single characters or very short incomplete commands
-        if len(stripped) <= 2 and not stripped.isdigit():
-            return True
-        
-        # Lines that end with cursor or partial input indicators
-        if stripped.endswith('_') or stripped.endswith('|'):
-            return True
+        for line in text.split('\n'):
+            # Blank lines never affect the filter state
+            if not line or line.isspace():
+                continue
             
-        return False
-
-    def _is_empty_prompt(self, line_content):
-        """ Check if this is just an empty prompt with no command, possibly with error code """
-        if not line_content:
-            return True
+            # rstrip once for output; only lstrip for classification when needed
+            rstripped = line.rstrip()
+            stripped = rstripped.lstrip() if rstripped[0].isspace() else rstripped
+            kind = _classify(stripped)
             
-        stripped = line_content.strip()
-        
-        # Check for empty prompt patterns
-        if stripped == '└─#':
-            return True
-        
-        # Check for prompts with only error codes at the end
-        # Pattern: └─# followed by spaces and then error indicator like "2 ⨯" or "1 ✗" etc.
-        if stripped.startswith('└─#'):
-            # Remove the prompt part
-            after_prompt = stripped[3:].strip()
-            
-            # If nothing after prompt, it's empty
-            if not after_prompt:
-                return True
-            
-            # Check if it's only whitespace followed by error code patterns
-            # Common patterns: "2 ⨯", "1 ✗", "130 ⨯", etc.
-            error_pattern = r'^\s*\d+\s*[⨯✗×✘❌]\s*$'
-            if re.match(error_pattern, after_prompt):
-                return True
-        
-        # Check other common prompt formats with error codes
-        # Pattern: ending with $ or # followed by spaces and error indicator
-        for prompt_suffix in ['$ ', '# ']:
-            if prompt_suffix in stripped:
-                parts = stripped.rsplit(prompt_suffix, 1)
-                if len(parts) == 2:
-                    after_prompt = parts[1].strip()
-                    if not after_prompt:
-                        return True
-                    # Check for error code pattern
-                    error_pattern = r'^\s*\d+\s*[⨯✗×✘❌]\s*$'
-                    if re.match(error_pattern, after_prompt):
-                        return True
-        
-        return False
-
-    def _is_context_command(self, line_content):
-        """ Check if this line contains a command that starts with 'context' """
-        if not line_content:
-            return False
-        
-        stripped = line_content.strip()
-        
-        # Look for commands that start with "context" after prompt indicators
-        # Handle various prompt formats
-        if self._looks_like_prompt(stripped):
-            # Extract command part after prompt
-            if '└─#' in stripped:
-                cmd_part = stripped.split('└─#', 1)[-1].strip()
-            elif stripped.endswith('$ ') or stripped.endswith('# '):
-                # Handle other prompt formats
-                for prompt_end in ['$ ', '# ']:
-                    if stripped.endswith(prompt_end):
-                        cmd_part = stripped[:-len(prompt_end)].strip()
-                        break
-                else:
-                    cmd_part = ""
-            else:
-                cmd_part = ""
+            # A "context" command hides its output up to the next prompt
+            if kind == _KIND_PROMPT_CONTEXT:
+                skip_until_prompt = True
+                continue
             
-            return cmd_part.startswith('context')
+            if skip_until_prompt:
+                if kind == _KIND_PROMPT or kind == _KIND_PROMPT_EMPTY:
+                    skip_until_prompt = False
+                    # Include the new prompt line
+                    if kind == _KIND_PROMPT:
+                        filtered_lines.append(rstripped)
+                continue
+            
+            if kind == _KIND_NORMAL or kind == _KIND_PROMPT:
+                filtered_lines.append(rstripped)
         
-        # Also check if it's just a bare context command (without prompt)
-        return stripped.startswith('context')
-
-
-
-
+        return filtered_lines
 
     def _start_logging(self, terminal):
         """ Start logging for a terminal with unique ID and async I/O """
@@ -518,77 +1035,86 @@ class AutoLogger(plugin.Plugin):
             initial_col, initial_row = cursor_pos if cursor_pos and len(cursor_pos) == 2 else (0, 0)
             
             contents_handler = vte_terminal.connect('contents-changed', self._on_contents_changed)
+            # Column count only changes on resize or font change, keep it cached
+            resize_handler = vte_terminal.connect('size-allocate', self._on_size_changed)
+            char_size_handler = vte_terminal.connect('char-size-changed', self._on_size_changed)
             
-            self.loggers[vte_terminal] = {
+            logger_info = {
                 "filepath": original_logfile,
                 "sanitized_filepath": sanitized_logfile,
+                "file_id": AutoLogger._filepath_id(original_logfile),
+                "sanitized_file_id": AutoLogger._filepath_id(sanitized_logfile),
                 "terminal_id": terminal_id,
                 "last_col": initial_col,
                 "last_row": initial_row,
-                "contents_handler": contents_handler
+                "last_cursor_row": initial_row,
+                "last_signal_time": 0,
+                "col_count": vte_terminal.get_column_count(),
+                "contents_handler": contents_handler,
+                "resize_handler": resize_handler,
+                "char_size_handler": char_size_handler
             }
+            self.loggers[vte_terminal] = logger_info
             
             try:
-                if not os.path.exists(original_logfile) or os.path.getsize(original_logfile) == 0:
-                    session_start = f"=== Terminal session started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n"
-                    self.write_queue.put((original_logfile, session_start), timeout=0.1)
-                    self.sanitize_queue.put((session_start, sanitized_logfile), timeout=0.1)
+                # Only the first attach to a log path needs to stat it for a session header
+                if original_logfile in AutoLogger._seeded_files:
+                    return
+                
+                with AutoLogger._seed_lock:
+                    if original_logfile in AutoLogger._seeded_files:
+                        return
+                    AutoLogger._seeded_files.add(original_logfile)
+                    is_new_file = (not os.path.exists(original_logfile) or
+                                   os.path.getsize(original_logfile) == 0)
+                
+                if is_new_file:
+                    session_start = f"=== Terminal session started at {time.strftime('%Y-%m-%d %H:%M:%S')} ===\n".encode('utf-8')
+                    _put_drop_oldest(self.write_queue, (logger_info["file_id"], session_start))
+                    _put_drop_oldest(self.sanitize_queue, (logger_info["sanitized_file_id"], session_start))
                     
-                    # Capture initial terminal content (including the current prompt)
-                    initial_content = self._get_content(vte_terminal, 0, 0, 
-                                                      vte_terminal.get_row_count(), 
-                                                      vte_terminal.get_column_count())
+                    # Capture initial terminal content (including the current prompt) before any
+                    # contents-changed block can be queued behind it
+                    self._capture_initial_content(vte_terminal, initial_row)
                     
-                    if initial_content:
-                        lines = initial_content.split('\n')
-                        filtered_lines = []
-                        skip_until_prompt = False
-                        
-                        for line in lines:
-                            stripped = line.strip()
-                            
-                            # Check if this line starts a "context" command
-                            if self._is_context_command(stripped):
-                                skip_until_prompt = True
-                                continue
-                            
-                            # If we're skipping context output, check if we hit a new prompt
-                            if skip_until_prompt:
-                                if self._looks_like_prompt(stripped):
-                                    skip_until_prompt = False
-                                    # Include the new prompt line
-                                    if not self._is_empty_prompt(stripped):
-                                        filtered_lines.append(line.rstrip())
-                                continue
-                            
-                            if stripped and not stripped.startswith('==='):
-                                if not self._is_empty_prompt(stripped):
-                                    if not self._is_partial_command(stripped):
-                                        filtered_lines.append(line.rstrip())
-                        
-                        if filtered_lines:
-                            initial_log = '\n'.join(filtered_lines) + '\n'
-                            self.write_queue.put((original_logfile, initial_log), timeout=0.1)
-                            self.sanitize_queue.put((initial_log, sanitized_logfile), timeout=0.1)
-                            
-            except (queue.Full, Exception):
+            except Exception:
                 pass
                 
         except Exception:
             pass
 
+    def _capture_initial_content(self, vte_terminal, cursor_row):
+        """ Log the rows above the cursor when a new log file is started """
+        try:
+            logger_info = self.loggers[vte_terminal]
+            start_row = max(0, cursor_row - _SNAPSHOT_MAX_ROWS)
+            initial_content = self._get_content(vte_terminal, start_row, 0,
+                                                cursor_row, logger_info["col_count"])
+            
+            if initial_content:
+                _put_drop_oldest(self.filter_queue, (initial_content, logger_info["file_id"],
+                                                     logger_info["sanitized_file_id"]))
+                
+        except Exception:
+            pass
+
     def _stop_logging(self, vte_terminal):
         """ Stop logging for a terminal """
         if vte_terminal not in self.loggers:
             return
             
         try:
-            # Disconnect signal handler
-            handler_id = self.loggers[vte_terminal]["contents_handler"]
-            if handler_id and vte_terminal.handler_is_connected(handler_id):
-                vte_terminal.disconnect(handler_id)
+            # Disconnect signal handlers
+            logger_info = self.loggers[vte_terminal]
+            for handler_key in ("contents_handler", "resize_handler", "char_size_handler"):
+                handler_id = logger_info.get(handler_key)
+                if handler_id and vte_terminal.handler_is_connected(handler_id):
+                    vte_terminal.disconnect(handler_id)
             
-            # Clean up dictionaries
+            # Clean up dictionaries; the next attach re-checks the log for a session header
+            self._last_written_hash.pop(logger_info["filepath"], None)
+            with AutoLogger._seed_lock:
+                AutoLogger._seeded_files.discard(logger_info["filepath"])
             del self.loggers[vte_terminal]
             
             if vte_terminal in self.terminal_ids:
@@ -606,6 +1132,10 @@ class AutoLogger(plugin.Plugin):
 
     def unload(self):
         """ Clean up when plugin unloads """
+        # Stop following terminal registration
+        if self in AutoLogger._terminal_listeners:
+            AutoLogger._terminal_listeners.remove(self)
+        
         # Stop all terminal logging
         for vte_terminal in list(self.loggers.keys()):
             self._stop_logging(vte_terminal)
@@ -613,38 +1143,9 @@ class AutoLogger(plugin.Plugin):
         # Clean up any remaining references
         self.loggers.clear()
         self.terminal_ids.clear()
+        self._last_written_hash.clear()
         
-        # Shutdown background threads
-        self._shutdown_writer = True
-        
-        # Signal threads to stop
-        try:
-            self.write_queue.put(None, timeout=0.5)
-        except:
-            pass
-        try:
-            self.sanitize_queue.put(None, timeout=0.5)
-        except:
-            pass
-        
-        # Wait for threads to finish
-        try:
-            self.writer_thread.join(timeout=2.0)
-            self.sanitizer_thread.join(timeout=2.0)
-        except:
-            pass
-        
-        # Clear queues
-        try:
-            while not self.write_queue.empty():
-                self.write_queue.get_nowait()
-                self.write_queue.task_done()
-        except:
-            pass
-        
-        try:
-            while not self.sanitize_queue.empty():
-                self.sanitize_queue.get_nowait()
-                self.sanitize_queue.task_done()
-        except:
-            pass
+        # Release the shared worker threads
+        if not self._unloaded:
+            self._unloaded = True
+            AutoLogger._stop_workers()